@@ -191,7 +191,6 @@ class Results:
     synonyms: List = field(default_factory=list)
     antonyms: List = field(default_factory=list)
     examples: List[Example] = field(default_factory=list)
-    timeSeries: List[List[float]] = field(default_factory=list)
     collocates: List = field(default_factory=list)
     nearestNeighbors: List = field(default_factory=list)
     fuzzyResults: List[FuzzyResult] = field(default_factory=list)
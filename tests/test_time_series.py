@@ -0,0 +1,189 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import time_series
+from time_series import (
+    MAX_TIME_SERIES_BUCKETS,
+    MAX_TIME_SERIES_HEADWORDS,
+    MAX_TIME_SERIES_YEAR,
+    MIN_TIME_SERIES_YEAR,
+    TimeSeriesCache,
+    aggregate_time_series,
+    empty_time_series,
+    get_date_range,
+    is_valid_time_series_query,
+    parse_time_series,
+    router,
+)
+
+
+def test_bucketing_averages_years_in_each_bucket():
+    years, frequencies = parse_time_series([[1700, 1], [1701, 3], [1705, 5], [1712, 7]])
+    assert aggregate_time_series(years, frequencies, 1700, 1719, 10, 1) == [[1700, 3.0], [1710, 7.0]]
+
+
+def test_partial_last_bucket_is_kept():
+    years, frequencies = parse_time_series([[1700, 2], [1710, 4], [1712, 6]])
+    assert aggregate_time_series(years, frequencies, 1700, 1712, 10, 1) == [[1700, 2.0], [1710, 5.0]]
+
+
+def test_start_date_not_aligned_to_data():
+    years, frequencies = parse_time_series([[1600, 1], [1603, 3], [1608, 5], [1620, 7]])
+    assert aggregate_time_series(years, frequencies, 1603, 1612, 5, 1) == [[1603, 3.0], [1608, 5.0]]
+
+
+def test_empty_buckets_are_omitted():
+    years, frequencies = parse_time_series([[1600, 1], [1601, 2], [1602, 3], [1610, 4], [1650, 5]])
+    assert aggregate_time_series(years, frequencies, 1600, 1650, 10, 1) == [[1600, 2.0], [1610, 4.0], [1650, 5.0]]
+
+
+def test_yearly_buckets_return_only_stored_points():
+    pairs = [[year, year / 1000] for year in range(1600, 2000, 10)]
+    years, frequencies = parse_time_series(pairs)
+    assert aggregate_time_series(years, frequencies, 1600, 1990, 1, 1) == pairs
+
+
+def test_smoothing_ignores_empty_buckets():
+    years, frequencies = parse_time_series([[1600, 1], [1601, 2], [1602, 3], [1610, 4], [1650, 5]])
+    assert aggregate_time_series(years, frequencies, 1600, 1650, 10, 3) == [[1600, 3.0], [1610, 3.0], [1650, 5.0]]
+
+
+def test_small_frequencies_are_not_rounded():
+    years, frequencies = parse_time_series([[1700, 0.00001234]])
+    assert aggregate_time_series(years, frequencies, 1700, 1700, 1, 1) == [[1700, 0.00001234]]
+
+
+def test_smoothing_window_is_centered():
+    years, frequencies = parse_time_series([[1600, 1], [1610, 2], [1620, 6]])
+    assert aggregate_time_series(years, frequencies, 1600, 1620, 10, 3) == [[1600, 1.5], [1610, 3.0], [1620, 4.0]]
+
+
+def test_smoothing_window_wider_than_series():
+    years, frequencies = parse_time_series([[1600, 1], [1601, 3]])
+    assert aggregate_time_series(years, frequencies, 1600, 1601, 1, 51) == [[1600, 2.0], [1601, 2.0]]
+
+
+def test_even_smoothing_is_rejected():
+    years, frequencies = parse_time_series([[1600, 1], [1610, 3]])
+    with pytest.raises(ValueError):
+        aggregate_time_series(years, frequencies, 1600, 1610, 10, 2)
+    assert not is_valid_time_series_query(1600, 1610, 10, 2)
+
+
+def test_bucket_cap():
+    assert is_valid_time_series_query(1, MAX_TIME_SERIES_BUCKETS, 1, 1)
+    assert not is_valid_time_series_query(0, MAX_TIME_SERIES_BUCKETS, 1, 1)
+    assert is_valid_time_series_query(0, MAX_TIME_SERIES_BUCKETS, 2, 1)
+    assert not is_valid_time_series_query(1700, 1600, 10, 1)
+    assert not is_valid_time_series_query(1600, 1700, 0, 1)
+
+
+def test_dates_out_of_range_are_rejected():
+    assert not is_valid_time_series_query(2147483648, 2147483650, 1, 1)
+    assert not is_valid_time_series_query(MIN_TIME_SERIES_YEAR - 1, MIN_TIME_SERIES_YEAR, 1, 1)
+    assert is_valid_time_series_query(MAX_TIME_SERIES_YEAR, MAX_TIME_SERIES_YEAR, 1, 1)
+
+
+def test_date_range_from_data():
+    all_series = {
+        "a": parse_time_series([[1650, 1], [1700, 2]]),
+        "b": parse_time_series([[1620, 1], [1680, 2]]),
+        "unknown": parse_time_series([]),
+    }
+    assert get_date_range(all_series, None, None) == (1620, 1700)
+    assert get_date_range(all_series, 1600, None) == (1600, 1700)
+    assert get_date_range(all_series, 1800, None) == (1800, 1800)
+    assert get_date_range({"unknown": parse_time_series(None)}, None, None) == (0, 0)
+
+
+def test_parse_time_series():
+    years, frequencies = parse_time_series([[1700, 1.5], [1701.0, 2]])
+    assert years.dtype == np.int32 and frequencies.dtype == np.float64
+    assert years.tolist() == [1700, 1701]
+    assert not years.flags.writeable
+    assert parse_time_series(None)[0].size == 0
+    for malformed in ([1700, 1701], [[1700, 1, 2]], [[1700, "a"]], [[1700, 1], [1701]], {"1700": 1}, [[1700, None]], [[3e9, 1]]):
+        assert parse_time_series(malformed) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TimeSeriesCache(maxsize=2)
+    cache.put("a", parse_time_series([[1700, 1]]))
+    cache.put("b", parse_time_series([[1700, 2]]))
+    assert cache.get("a") is not None
+    cache.put("c", parse_time_series([[1700, 3]]))
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_cache_get_missing_headword():
+    cache = TimeSeriesCache(maxsize=1)
+    assert cache.get("a") is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    stored = {
+        "chat": parse_time_series([[1700, 1], [1705, 3], [1710, 5]]),
+        "chien": parse_time_series([[1690, 2], [1720, 4]]),
+    }
+    requested = []
+
+    def fake_load_time_series(headwords):
+        requested.append(headwords)
+        return {headword: stored.get(headword, empty_time_series()) for headword in headwords}
+
+    monkeypatch.setattr(time_series, "load_time_series", fake_load_time_series)
+    app = FastAPI()
+    app.include_router(router)
+    test_client = TestClient(app)
+    test_client.requested = requested
+    return test_client
+
+
+def test_endpoint_follows_request_order_and_dedups(client):
+    response = client.get("/api/timeseries", params={"headwords": ["chien", "chat", "chien"], "interval": 10})
+    assert client.requested == [["chien", "chat"]]
+    assert response.json() == {
+        "startDate": 1690,
+        "endDate": 1720,
+        "interval": 10,
+        "smoothing": 1,
+        "results": [
+            {"headword": "chien", "timeSeries": [[1690, 2.0], [1720, 4.0]]},
+            {"headword": "chat", "timeSeries": [[1700, 2.0], [1710, 5.0]]},
+        ],
+    }
+
+
+def test_endpoint_unknown_headword_is_empty(client):
+    response = client.get("/api/timeseries", params={"headwords": ["inconnu", "chat"], "startDate": 1700})
+    results = response.json()["results"]
+    assert results[0] == {"headword": "inconnu", "timeSeries": []}
+    assert results[1]["timeSeries"] == [[1700, 1.0], [1705, 3.0], [1710, 5.0]]
+
+
+def test_endpoint_start_date_after_data(client):
+    response = client.get("/api/timeseries", params={"headwords": ["chat"], "startDate": 1800})
+    assert response.json()["results"] == [{"headword": "chat", "timeSeries": []}]
+
+
+def test_endpoint_rejects_too_many_headwords(client):
+    headwords = [f"mot{index}" for index in range(MAX_TIME_SERIES_HEADWORDS + 1)]
+    response = client.get("/api/timeseries", params={"headwords": headwords})
+    assert response.json() == {"message": "error"}
+    assert client.requested == []
+
+
+def test_endpoint_rejects_invalid_ranges(client):
+    for params in (
+        {"startDate": 1720, "endDate": 1700},
+        {"startDate": 2147483648, "endDate": 2147483650},
+        {"startDate": 0, "endDate": MAX_TIME_SERIES_BUCKETS},
+        {"smoothing": 2},
+        {"interval": 0},
+    ):
+        response = client.get("/api/timeseries", params={"headwords": ["chat"], **params})
+        assert response.json() == {"message": "error"}
@@ -0,0 +1,209 @@
+"""Time series aggregation for headword frequencies"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import psycopg2
+import psycopg2.extras
+from fastapi import APIRouter, Query
+
+MAX_TIME_SERIES_BUCKETS = 2000
+MAX_TIME_SERIES_HEADWORDS = 10
+MIN_TIME_SERIES_YEAR = -10000
+MAX_TIME_SERIES_YEAR = 10000
+
+TimeSeriesArrays = Tuple[np.ndarray, np.ndarray]
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@dataclass
+class HeadwordTimeSeries:
+    """Aggregated time series for one headword"""
+
+    headword: str
+    timeSeries: List[List[float]] = field(default_factory=list)
+
+
+@dataclass
+class TimeSeriesResults:
+    """TimeSeriesResults to export"""
+
+    startDate: int
+    endDate: int
+    interval: int
+    smoothing: int
+    results: List[HeadwordTimeSeries] = field(default_factory=list)
+
+
+class TimeSeriesCache:
+    """Thread-safe least recently used cache of time series arrays keyed by headword"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[str, TimeSeriesArrays]" = OrderedDict()
+        self.lock = Lock()
+
+    def __contains__(self, headword: str) -> bool:
+        with self.lock:
+            return headword in self.entries
+
+    def get(self, headword: str) -> Optional[TimeSeriesArrays]:
+        with self.lock:
+            series = self.entries.get(headword)
+            if series is not None:
+                self.entries.move_to_end(headword)
+            return series
+
+    def put(self, headword: str, series: TimeSeriesArrays):
+        with self.lock:
+            self.entries[headword] = series
+            self.entries.move_to_end(headword)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
+TIME_SERIES_CACHE = TimeSeriesCache(maxsize=5000)
+
+
+def empty_time_series() -> TimeSeriesArrays:
+    return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+
+
+def parse_time_series(raw_series: Any) -> Optional[TimeSeriesArrays]:
+    """Convert stored [[year, frequency], ...] pairs to read-only year and frequency arrays.
+    Returns None if the stored value is not a list of numeric pairs with years in range."""
+    if raw_series is None:
+        return empty_time_series()
+    try:
+        series = np.array(raw_series, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if series.size == 0:
+        return empty_time_series()
+    if series.ndim != 2 or series.shape[1] != 2 or not np.isfinite(series).all():
+        return None
+    if (series[:, 0] < MIN_TIME_SERIES_YEAR).any() or (series[:, 0] > MAX_TIME_SERIES_YEAR).any():
+        return None
+    years = series[:, 0].astype(np.int32)
+    frequencies = series[:, 1].copy()
+    years.setflags(write=False)
+    frequencies.setflags(write=False)
+    return years, frequencies
+
+
+def load_time_series(headwords: List[str]) -> Dict[str, TimeSeriesArrays]:
+    """Load time series as compact year and frequency arrays, fetching uncached headwords in one query"""
+    # datamodels connects to the database on import, so only load it once a query is needed
+    from datamodels import GLOBAL_CONFIG
+
+    all_series: Dict[str, TimeSeriesArrays] = {}
+    missing: List[str] = []
+    for headword in headwords:
+        series = TIME_SERIES_CACHE.get(headword)
+        if series is None:
+            missing.append(headword)
+        else:
+            all_series[headword] = series
+    if missing:
+        with psycopg2.connect(
+            user=GLOBAL_CONFIG["user"], password=GLOBAL_CONFIG["password"], database=GLOBAL_CONFIG["databaseName"]
+        ) as conn:
+            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            cursor.execute("SELECT headword, time_series FROM headwords WHERE headword = ANY(%s)", (missing,))
+            for row in cursor:
+                series = parse_time_series(row["time_series"])
+                if series is None:
+                    logger.warning("Skipping malformed time series for headword %s", row["headword"])
+                    series = empty_time_series()
+                all_series[row["headword"]] = series
+        # Unknown headwords are cached as empty so repeated lookups don't hit the database
+        for headword in missing:
+            TIME_SERIES_CACHE.put(headword, all_series.setdefault(headword, empty_time_series()))
+    return {headword: all_series[headword] for headword in headwords}
+
+
+def get_date_range(
+    all_series: Dict[str, TimeSeriesArrays], start_date: Optional[int], end_date: Optional[int]
+) -> Tuple[int, int]:
+    """Fill in missing start and end dates from the years covered by the requested headwords"""
+    all_years = [years for years, _ in all_series.values() if years.size > 0]
+    if start_date is None:
+        start_date = min((int(years.min()) for years in all_years), default=0)
+    if end_date is None:
+        end_date = max((int(years.max()) for years in all_years), default=start_date)
+        end_date = max(start_date, end_date)
+    return start_date, end_date
+
+
+def is_valid_time_series_query(start_date: int, end_date: int, interval: int, smoothing: int) -> bool:
+    """Check date range, bucket width and smoothing window before aggregating"""
+    if interval < 1 or smoothing < 1 or smoothing % 2 == 0:
+        return False
+    if start_date < MIN_TIME_SERIES_YEAR or end_date > MAX_TIME_SERIES_YEAR or end_date < start_date:
+        return False
+    return (end_date - start_date) // interval + 1 <= MAX_TIME_SERIES_BUCKETS
+
+
+def aggregate_time_series(
+    years: np.ndarray, frequencies: np.ndarray, start_date: int, end_date: int, interval: int, smoothing: int
+) -> List[List[float]]:
+    """Average frequencies in buckets of interval years, then apply a centered moving average of smoothing buckets.
+    Buckets with no stored years are left out of the output and of their neighbors' averages.
+    smoothing must be odd so the window is centered on each bucket."""
+    if smoothing < 1 or smoothing % 2 == 0:
+        raise ValueError("smoothing must be a positive odd number")
+    bucket_count = (end_date - start_date) // interval + 1
+    in_range = (years >= start_date) & (years <= end_date)
+    buckets = (years[in_range] - start_date) // interval
+    totals = np.bincount(buckets, weights=frequencies[in_range], minlength=bucket_count)
+    counts = np.bincount(buckets, minlength=bucket_count)
+    occupied = counts > 0
+    values = np.divide(totals, counts, out=np.zeros(bucket_count), where=occupied)
+    if smoothing > 1:
+        kernel = np.ones(smoothing)
+        half_window = smoothing // 2
+        # Full convolution sliced at half_window keeps the window centered even when it is wider than the series
+        window_sums = np.convolve(values, kernel)[half_window : half_window + bucket_count]
+        window_counts = np.convolve(occupied.astype(np.float64), kernel)[half_window : half_window + bucket_count]
+        values = np.divide(window_sums, window_counts, out=np.zeros(bucket_count), where=occupied)
+    bucket_indexes = np.flatnonzero(occupied)
+    bucket_starts = (start_date + bucket_indexes * interval).tolist()
+    return [[year, value] for year, value in zip(bucket_starts, values[bucket_indexes].tolist())]
+
+
+@router.get("/api/timeseries")
+def time_series(
+    headwords: List[str] = Query(...),
+    startDate: None | int = None,
+    endDate: None | int = None,
+    interval: int = 1,
+    smoothing: int = 1,
+):
+    headwords = list(dict.fromkeys(headwords))
+    if len(headwords) > MAX_TIME_SERIES_HEADWORDS:
+        return {"message": "error"}
+    all_series = load_time_series(headwords)
+    startDate, endDate = get_date_range(all_series, startDate, endDate)
+    if not is_valid_time_series_query(startDate, endDate, interval, smoothing):
+        return {"message": "error"}
+    results: List[HeadwordTimeSeries] = []
+    for headword, (years, frequencies) in all_series.items():
+        if years.size == 0:
+            results.append(HeadwordTimeSeries(headword=headword))
+            continue
+        results.append(
+            HeadwordTimeSeries(
+                headword=headword,
+                timeSeries=aggregate_time_series(years, frequencies, startDate, endDate, interval, smoothing),
+            )
+        )
+    return TimeSeriesResults(
+        startDate=startDate, endDate=endDate, interval=interval, smoothing=smoothing, results=results
+    )
@@ -36,6 +36,7 @@ from datamodels import (
     UserSubmit,
     Wordwheel,
 )
+from time_series import router as time_series_router
 
 app = FastAPI()
 app.add_middleware(
@@ -50,6 +51,8 @@ app.mount("/css", StaticFiles(directory="public/dist/css"), name="css")
 app.mount("/js", StaticFiles(directory="public/dist/js"), name="js")
 app.mount("/img", StaticFiles(directory="public/dist/img"), name="img")
 
+app.include_router(time_series_router)
+
 
 def get_similar_headwords(headword: str) -> List[FuzzyResult]:
     results: List[FuzzyResult] = []
@@ -400,7 +403,7 @@ def query_headword(headword: str):
     ) as conn:
         cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
         cursor.execute(
-            "SELECT user_submit, dictionaries, synonyms, antonyms, examples, time_series, collocations, nearest_neighbors FROM headwords WHERE headword=%s",
+            "SELECT user_submit, dictionaries, synonyms, antonyms, examples, collocations, nearest_neighbors FROM headwords WHERE headword=%s",
             (headword,),
         )
         row = cursor.fetchone()
@@ -419,7 +422,6 @@ def query_headword(headword: str):
             synonyms=row["synonyms"],
             antonyms=row["antonyms"],
             examples=sorted_examples,
-            timeSeries=row["time_series"],
             collocates=decamelize(row["collocations"]),
             nearestNeighbors=row["nearest_neighbors"],
             fuzzyResults=fuzzy_results,